@@ -0,0 +1,147 @@
+"""Fast J2-only orbit propagation for coarse visibility screening.
+
+Full SGP4 is more accurate than needed to decide whether a satellite can be
+anywhere near an observer's horizon. This secular J2 model is compiled with
+Numba and is used to discard the minutes where a satellite is clearly out of
+view, so the expensive SGP4 + Skyfield pipeline only runs on candidates.
+"""
+import math
+
+import numpy as np
+from numba import njit, prange
+
+# WGS84 ellipsoid (km); server.py imports these rather than keeping its own copy
+WGS84_A = 6378.137
+WGS84_E2 = 6.69437999014e-3
+WGS84_B = WGS84_A * math.sqrt(1.0 - WGS84_E2)  # polar radius
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)  # second eccentricity squared
+
+RADIUS_EARTH_KM = WGS84_A
+J2 = 1.08262668e-3
+
+# Column layout of an element row produced by elements_from_catalog()
+A, ECC, INCL, RAAN, ARGP, M0, N, EPOCH = range(8)
+
+
+def elements_from_catalog(catalog):
+    """Stack struct-of-arrays catalog columns into the (N, 8) element rows j2_propagate reads"""
+    return np.column_stack([
+        catalog['a'],
+        catalog['ecco'],
+        catalog['inclo'],
+        catalog['nodeo'],
+        catalog['argpo'],
+        catalog['mo'],
+        catalog['no_kozai'],
+        catalog['jdsatepoch'],
+    ])
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def j2_propagate(elements, t_min, theta):
+    """Propagate one element row to minutes-since-epoch t_min.
+
+    theta is the Greenwich sidereal angle (radians) at each time, used to
+    rotate the inertial result into Earth-fixed coordinates. Returns an
+    (M, 3) array of ECEF positions in km.
+    """
+    a = elements[A]
+    e = elements[ECC]
+    i = elements[INCL]
+    n = elements[N]
+
+    p = a * (1.0 - e * e)
+    k = 1.5 * J2 * (RADIUS_EARTH_KM / p) ** 2 * n
+    cos_i = math.cos(i)
+    sin_i = math.sin(i)
+    raan_dot = -k * cos_i
+    argp_dot = 0.5 * k * (5.0 * cos_i * cos_i - 1.0)
+    m_dot = n + 0.5 * k * math.sqrt(1.0 - e * e) * (3.0 * cos_i * cos_i - 1.0)
+
+    out = np.empty((t_min.shape[0], 3))
+    for j in prange(t_min.shape[0]):
+        t = t_min[j]
+        raan = elements[RAAN] + raan_dot * t
+        argp = elements[ARGP] + argp_dot * t
+        m = elements[M0] + m_dot * t
+
+        # Kepler's equation; a few Newton steps suffice for LEO eccentricities
+        ea = m
+        for _ in range(5):
+            ea -= (ea - e * math.sin(ea) - m) / (1.0 - e * math.cos(ea))
+
+        # Perifocal position, then rotate by argp, inclination and RAAN
+        xp = a * (math.cos(ea) - e)
+        yp = a * math.sqrt(1.0 - e * e) * math.sin(ea)
+        cw, sw = math.cos(argp), math.sin(argp)
+        co, so = math.cos(raan), math.sin(raan)
+        x1 = cw * xp - sw * yp
+        y1 = sw * xp + cw * yp
+        x = co * x1 - so * cos_i * y1
+        y = so * x1 + co * cos_i * y1
+        z = sin_i * y1
+
+        ct, st = math.cos(theta[j]), math.sin(theta[j])
+        out[j, 0] = ct * x + st * y
+        out[j, 1] = ct * y - st * x
+        out[j, 2] = z
+    return out
+
+
+@njit(cache=True)
+def find_passes(alt_deg, min_alt=10.0):
+    """Scan an elevation series once for runs above min_alt.
+
+    Returns (starts, ends, peaks) index arrays: each pass covers samples
+    [start, end) and peaks at index peak.
+    """
+    n = alt_deg.shape[0]
+    starts = np.empty(n // 2 + 1, dtype=np.int64)
+    ends = np.empty_like(starts)
+    peaks = np.empty_like(starts)
+    count = 0
+    in_pass = False
+    for j in range(n):
+        if alt_deg[j] > min_alt:
+            if not in_pass:
+                in_pass = True
+                starts[count] = j
+                peaks[count] = j
+            elif alt_deg[j] > alt_deg[peaks[count]]:
+                peaks[count] = j
+        elif in_pass:
+            in_pass = False
+            ends[count] = j
+            count += 1
+    if in_pass:
+        ends[count] = n
+        count += 1
+    return starts[:count], ends[:count], peaks[:count]
+
+
+@njit(cache=True)
+def geodetic_with_mask(xyz, lat_range, lon_range):
+    """Fused ECEF -> WGS84 geodetic conversion and lat/lon box test.
+
+    xyz is (3, n) in km. Returns (lat_deg, lon_deg, alt_km, in_box) arrays
+    of length n, using the same Bowring closed form as server._ecef_to_geodetic
+    (keep the two in step) in one loop with no temporaries. The box is
+    inclusive on every edge.
+    """
+    n = xyz.shape[1]
+    lat_deg = np.empty(n)
+    lon_deg = np.empty(n)
+    alt_km = np.empty(n)
+    in_box = np.empty(n, dtype=np.bool_)
+    for j in range(n):
+        x, y, z = xyz[0, j], xyz[1, j], xyz[2, j]
+        r = math.hypot(x, y)
+        beta = math.atan2(z * WGS84_A, r * WGS84_B)
+        sin_b, cos_b = math.sin(beta), math.cos(beta)
+        lat = math.atan2(z + WGS84_EP2 * WGS84_B * sin_b ** 3, r - WGS84_E2 * WGS84_A * cos_b ** 3)
+        sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+        alt_km[j] = r * cos_lat + z * sin_lat - WGS84_A * math.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+        lat_deg[j] = math.degrees(lat)
+        lon_deg[j] = math.degrees(math.atan2(y, x))
+        in_box[j] = (lat_range[0] <= lat_deg[j] <= lat_range[1]) and (lon_range[0] <= lon_deg[j] <= lon_range[1])
+    return lat_deg, lon_deg, alt_km, in_box
@@ -11,20 +11,22 @@ class ORBITATester:
         self.tests_passed = 0
         self.selected_satellite_id = None
         self.version_checked = False
+        # One keep-alive session so every test reuses the same TCP/TLS connection
+        self.session = requests.Session()
+        self.session.headers['Content-Type'] = 'application/json'
 
     def run_test(self, name, method, endpoint, expected_status=200, data=None, params=None):
         """Run a single API test"""
         url = f"{self.base_url}{endpoint}"
-        headers = {'Content-Type': 'application/json'}
         
         self.tests_run += 1
         print(f"\n🔍 Testing {name}...")
         
         try:
             if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
+                response = self.session.get(url, params=params)
             elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
+                response = self.session.post(url, json=data)
 
             print(f"URL: {url}")
             print(f"Status Code: {response.status_code}")
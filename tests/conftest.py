@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+STATIONS_TXT = os.path.join(ROOT, 'stations.txt')
+
+
+@pytest.fixture(scope='session')
+def stations_text():
+    with open(STATIONS_TXT) as f:
+        return f.read()
+
+
+@pytest.fixture(scope='session')
+def server():
+    """server module with a timescale, without running the startup hooks"""
+    import server
+    from skyfield.api import load
+    server.ts = load.timescale(builtin=True)
+    return server
+
+
+@pytest.fixture(scope='session')
+def stations(server, stations_text):
+    """stations.txt loaded into the same globals _load_tles_async fills"""
+    names, line1, line2 = server._parse_tle_text(stations_text)
+    loaded = server._build_satellites(names, line1, line2)
+    server.sat_catalog = server._build_catalog(loaded)
+    server.sat_elements = server.elements_from_catalog(server.sat_catalog)
+    server.sat_index = {s.model.satnum: i for i, s in enumerate(loaded)}
+    return loaded
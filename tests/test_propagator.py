@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from sgp4.api import SatrecArray
+from skyfield.api import wgs84
+from skyfield.sgp4lib import theta_GMST1982
+
+from propagator import EPOCH, elements_from_catalog, find_passes, geodetic_with_mask, j2_propagate
+
+
+def _passes_by_diff(alt_deg, min_alt):
+    """Reference pass finder: edges of the above-threshold mask, peak by argmax"""
+    above = np.concatenate(([False], alt_deg > min_alt, [False]))
+    edges = np.flatnonzero(np.diff(above.astype(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    peaks = np.array([s + np.argmax(alt_deg[s:e]) for s, e in zip(starts, ends)], dtype=np.int64)
+    return starts, ends, peaks
+
+
+def test_find_passes_empty():
+    starts, ends, peaks = find_passes(np.empty(0), 10.0)
+    assert len(starts) == len(ends) == len(peaks) == 0
+
+
+def test_find_passes_none_above():
+    starts, _, _ = find_passes(np.full(50, 5.0), 10.0)
+    assert len(starts) == 0
+
+
+def test_find_passes_runs_to_end_of_grid():
+    alt = np.array([0.0, 5.0, 12.0, 30.0, 25.0, 40.0])
+    starts, ends, peaks = find_passes(alt, 10.0)
+    assert starts.tolist() == [2]
+    assert ends.tolist() == [6]
+    assert peaks.tolist() == [5]
+
+
+def test_find_passes_alternating_samples():
+    alt = np.array([20.0, 0.0] * 6 + [20.0])
+    starts, ends, peaks = find_passes(alt, 10.0)
+    assert starts.tolist() == list(range(0, 13, 2))
+    assert ends.tolist() == list(range(1, 14, 2))
+    assert peaks.tolist() == starts.tolist()
+
+
+def test_find_passes_threshold_is_exclusive():
+    starts, _, _ = find_passes(np.array([10.0, 10.0, 11.0]), 10.0)
+    assert starts.tolist() == [2]
+
+
+def test_find_passes_matches_diff_reference():
+    rng = np.random.default_rng(0)
+    alt = np.convolve(rng.normal(0, 30, 5000), np.ones(15) / 15, mode="same") * 4
+    for got, want in zip(find_passes(alt, 10.0), _passes_by_diff(alt, 10.0)):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_geodetic_with_mask_matches_numpy_path(server, stations):
+    t = server.ts.tt_jd(server.sat_catalog['jdsatepoch'][0] + np.arange(0, 1, 1 / 288))
+    e, r, _ = server._propagate_batch(SatrecArray([s.model for s in stations]), t)
+    xyz = np.ascontiguousarray(server._teme_to_itrf(t, r).reshape(3, -1))
+    lat, lon, alt, in_box = geodetic_with_mask(xyz, server.AFRICA_LAT, server.AFRICA_LON)
+    ref_lat, ref_lon, ref_alt = server._ecef_to_geodetic(xyz)
+    np.testing.assert_allclose(lat, ref_lat, rtol=0, atol=1e-11)
+    np.testing.assert_allclose(lon, ref_lon, rtol=0, atol=1e-11)
+    np.testing.assert_allclose(alt, ref_alt, rtol=0, atol=1e-9)
+    lat_lo, lat_hi = server.AFRICA_LAT
+    lon_lo, lon_hi = server.AFRICA_LON
+    np.testing.assert_array_equal(in_box, (lat_lo <= lat) & (lat <= lat_hi) & (lon_lo <= lon) & (lon <= lon_hi))
+
+
+@pytest.mark.parametrize("lat, lon, elevation_km", [
+    (0.0, 0.0, 0.0),
+    (51.5, -0.1, 420.0),
+    (-89.9, 120.0, 35786.0),
+    (6.4, 3.2, 800.0),
+])
+def test_geodetic_with_mask_inverts_skyfield_wgs84(lat, lon, elevation_km):
+    xyz = wgs84.latlon(lat, lon, elevation_m=elevation_km * 1000).itrs_xyz.km.reshape(3, 1)
+    got_lat, got_lon, got_alt, in_box = geodetic_with_mask(xyz, (-35.0, 37.0), (-20.0, 55.0))
+    assert got_lat[0] == pytest.approx(lat, abs=1e-6)
+    assert got_lon[0] == pytest.approx(lon, abs=1e-9)
+    assert got_alt[0] == pytest.approx(elevation_km, abs=1e-3)
+    assert in_box[0] == ((-35.0 <= lat <= 37.0) and (-20.0 <= lon <= 55.0))
+
+
+def test_j2_propagate_tracks_sgp4_near_epoch(server, stations):
+    elements = elements_from_catalog(server.sat_catalog)
+    for i, sat in enumerate(stations):
+        t = server.ts.tt_jd(elements[i, EPOCH] + np.arange(0, 0.25, 1 / 1440))
+        jd, fr = server._sgp4_epoch(t)
+        theta, _ = theta_GMST1982(t.whole, t.ut1_fraction)
+        j2 = j2_propagate(elements[i], (jd - elements[i, EPOCH] + fr) * 1440.0, theta)
+        _, r, _ = sat.model.sgp4_array(jd, fr)
+        sgp4 = server._teme_to_itrf(t, r.T).T
+        # Secular J2 only: tens of km against SGP4 over the first hours is
+        # plenty for a horizon screen padded by 5 minutes (~2300 km in LEO)
+        assert np.linalg.norm(j2 - sgp4, axis=1).max() < 100.0, sat.name
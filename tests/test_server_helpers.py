@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+
+def test_parse_tle_text_reads_every_station(server, stations_text):
+    names, line1, line2 = server._parse_tle_text(stations_text)
+    expected = sum(line.startswith('1 ') for line in stations_text.splitlines())
+    assert len(names) == len(line1) == len(line2) == expected
+    assert names[0] == 'ISS (ZARYA)'
+    assert all(l.startswith('1 ') for l in line1)
+    assert all(l.startswith('2 ') for l in line2)
+    assert all(a[2:7] == b[2:7] for a, b in zip(line1, line2))  # same catalog number on both lines
+
+
+def test_parse_tle_text_skips_blank_and_stray_lines(server):
+    text = (
+        "\n"
+        "ISS (ZARYA)\n"
+        "1 25544U 98067A   25185.47485775  .00005492  00000+0  10282-3 0  9993\n"
+        "2 25544  51.6344 221.3901 0002450 331.8120  28.2736 15.50368910517843\n"
+        "\n"
+        "garbage\n"
+    )
+    names, line1, line2 = server._parse_tle_text(text)
+    assert names == ['ISS (ZARYA)']
+    assert line1[0].startswith('1 25544U') and line2[0].startswith('2 25544')
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_utc_iso_grid_matches_skyfield(server, seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(30):
+        t0 = server.ts.tt_jd(2460000.5 + rng.uniform(0, 1000))
+        step_seconds = float(rng.choice([0.5, 1.0, 59.9, 60.0, 216.0, 3600.0]))
+        count = int(rng.integers(1, 50))
+        grid = server.ts.tt_jd(t0.tt + np.arange(count) * step_seconds / 86400.0)
+        assert server._utc_iso_grid(t0, step_seconds, count) == grid.utc_iso()
+
+
+@pytest.mark.parametrize("step_seconds, count", [
+    (1e9 * 60, 3),  # NaT past the int64 nanosecond range
+    (1e7 * 60, 1440),  # wraps around to the 17th century
+    (3_000_000 / 50 * 3600, 51),
+    (-1e12, 2),
+])
+def test_utc_iso_grid_rejects_out_of_range_grids(server, step_seconds, count):
+    t0 = server.ts.tt_jd(2461000.5)
+    with pytest.raises(ValueError):
+        server._utc_iso_grid(t0, step_seconds, count)
+
+
+def test_pass_prefilter_matches_full_grid(server, stations, monkeypatch):
+    iss = stations[0]
+    epoch = server.sat_catalog['jdsatepoch'][0]
+    monkeypatch.setattr(server.ts, 'now', lambda: server.ts.tt_jd(epoch + 0.1))
+    screened = server._compute_passes(iss, 6.5244, 3.3792, 2)
+    monkeypatch.setattr(server, 'J2_PREFILTER_MAX_SPAN_DAYS', 0)  # forces SGP4 on every minute
+    full = server._compute_passes(iss, 6.5244, 3.3792, 2)
+    assert screened
+    assert screened == full